@@ -3,6 +3,24 @@ class AFD:
     Implementa a representação de um Autômato Finito Determinístico (AFD)[cite: 15].
     Armazena os estados, alfabeto, transições, estado inicial e estados finais.
     """
+
+    # Cadeias a partir deste tamanho são simuladas "por saltos" com
+    # 'bytes.translate' (veja '_simulate_scan'), quando possível.
+    SCAN_MIN_LENGTH = 64
+
+    # '_simulate_scan' anda pela cadeia em blocos deste tamanho (em bytes)
+    # e só tenta saltar quando o AFD termina dois blocos seguidos no mesmo estado.
+    SCAN_BLOCK = 64
+
+    # Tamanho inicial e máximo (em bytes) da janela examinada de cada vez
+    # por '_simulate_scan'. A janela dobra enquanto o AFD não sai do estado.
+    SCAN_WINDOW_MIN = 64
+    SCAN_WINDOW_MAX = 4096
+
+    # Códigos especiais nas tabelas de 256 bytes de '_simulate_scan'.
+    _SEM_TRANSICAO = 254
+    _FORA_DO_ALFABETO = 255
+
     def __init__(self, estados, alfabeto, transicoes, estado_inicial, estados_finais):
         self.estados = set(estados)
         self.alfabeto = set(alfabeto)
@@ -10,39 +28,177 @@ class AFD:
         self.estado_inicial = estado_inicial
         self.estados_finais = set(estados_finais)
 
-    def simular(self, cadeia):
+        # Tabela de transições "achatada", usada por 'simulate':
+        # estados e símbolos viram índices inteiros, e a transição vira
+        # um acesso direto _table[estado][simbolo] (-1 = sem transição),
+        # sem criar tuplas nem calcular hashes a cada símbolo.
+        self._state_list = list(self.estados | {estado_inicial} |
+                                {destino for destino in transicoes.values()} |
+                                {origem for origem, _ in transicoes})
+        self._state_id = {estado: i for i, estado in enumerate(self._state_list)}
+        self._sym_id = {simbolo: j for j, simbolo in enumerate(self.alfabeto)}
+
+        self._table = [[-1] * len(self._sym_id) for _ in self._state_list]
+        for (origem, simbolo), destino in transicoes.items():
+            j = self._sym_id.get(simbolo)
+            if j is not None:
+                self._table[self._state_id[origem]][j] = self._state_id[destino]
+
+        # Bit i ligado = o estado de índice i é final.
+        self._accept_bits = 0
+        for estado in self.estados_finais:
+            if estado in self._state_id:
+                self._accept_bits |= 1 << self._state_id[estado]
+
+        # Tabelas de 256 bytes por estado (uma posição para cada byte de
+        # entrada), usadas por '_simulate_scan'. Só existem se todos os
+        # símbolos forem caracteres de 1 byte e os estados couberem em 1 byte.
+        # - '_lut[s][b]': próximo estado lendo o byte b (ou um código especial)
+        # - '_stay[s]': tabela para 'bytes.translate' que troca por 0 os bytes
+        #               que MANTÊM o AFD no estado s (laços) e por 1 os demais;
+        #               None se s não tem laço
+        self._lut = None
+        self._stay = None
+        if (len(self._state_list) < self._SEM_TRANSICAO and
+                all(len(simbolo) == 1 and ord(simbolo) <= 255 for simbolo in self.alfabeto)):
+            self._lut = []
+            self._stay = []
+            for s, linha in enumerate(self._table):
+                lut = bytearray([self._FORA_DO_ALFABETO]) * 256
+                for simbolo, j in self._sym_id.items():
+                    lut[ord(simbolo)] = linha[j] if linha[j] >= 0 else self._SEM_TRANSICAO
+                self._lut.append(bytes(lut))
+                if s in linha:
+                    self._stay.append(bytes(0 if destino == s else 1 for destino in lut))
+                else:
+                    self._stay.append(None)
+
+    def simulate(self, cadeia):
+        """
+        Simula a execução do AFD para uma cadeia de entrada, SEM imprimir nada.
+        Retorna a tupla (aceita, estado_final), onde 'estado_final' é o estado
+        em que a simulação parou (None se faltou uma transição).
+        """
+        # Cadeias (str) longas: tenta a simulação "por saltos". Listas,
+        # tuplas e iteradores de símbolos vão direto para o laço abaixo.
+        if (self._lut is not None and isinstance(cadeia, str) and
+                len(cadeia) >= self.SCAN_MIN_LENGTH):
+            try:
+                return self._simulate_scan(cadeia.encode('latin-1'))
+            except UnicodeEncodeError:
+                # Há um caractere fora de 1 byte (logo, fora do alfabeto):
+                # o laço abaixo encontra e reporta esse caso.
+                pass
+
+        # Variáveis locais são mais rápidas de acessar dentro do laço.
+        sym_id = self._sym_id
+        tabela = self._table
+        s = self._state_id[self.estado_inicial]
+
+        for simbolo in cadeia:
+            # Símbolo fora do alfabeto: REJEITA
+            j = sym_id.get(simbolo, -1)
+            if j < 0:
+                return False, self._state_list[s]
+
+            # Transição inexistente (estado de erro implícito): REJEITA
+            s = tabela[s][j]
+            if s < 0:
+                return False, None
+
+        return bool(self._accept_bits >> s & 1), self._state_list[s]
+
+    def _simulate_scan(self, buf):
+        """
+        Simula o AFD sobre 'buf' (bytes) pulando os trechos em que ele
+        fica parado no mesmo estado.
+
+        Normalmente anda símbolo por símbolo pela tabela '_lut', em blocos
+        de SCAN_BLOCK bytes. Se o AFD termina dois blocos seguidos no mesmo
+        estado s (com laço), provavelmente está num trecho longo parado em s:
+        uma janela da cadeia passa por 'translate', que marca com 1 os bytes
+        que fazem o AFD SAIR de s (em C), e '.find(1)' salta direto para a
+        próxima mudança. A janela começa pequena e dobra enquanto o AFD não
+        sai do estado, então o custo acompanha o tamanho do trecho pulado e
+        a memória extra fica limitada a SCAN_WINDOW_MAX bytes.
+        Retorna (aceita, estado_final), como 'simulate'.
+        """
+        lut = self._lut
+        stay = self._stay
+        bloco = self.SCAN_BLOCK
+        janela_max = self.SCAN_WINDOW_MAX
+        codigo_especial = self._SEM_TRANSICAO  # códigos >= a este não são estados
+        n = len(buf)
+        s = self._state_id[self.estado_inicial]
+        anterior = -1  # estado no fim do bloco anterior
+        pos = 0
+
+        while pos < n:
+            for byte in buf[pos:pos + bloco]:
+                destino = lut[s][byte]
+                if destino >= codigo_especial:
+                    if destino == self._FORA_DO_ALFABETO:
+                        return False, self._state_list[s]
+                    return False, None
+                s = destino
+            pos += bloco
+
+            stay_s = stay[s]
+            if s == anterior and stay_s is not None:
+                janela = self.SCAN_WINDOW_MIN
+                while pos < n:
+                    saida = buf[pos:pos + janela].translate(stay_s).find(1)
+                    if saida >= 0:
+                        pos += saida
+                        break
+                    pos += janela
+                    janela = min(janela * 2, janela_max)
+            anterior = s
+
+        return bool(self._accept_bits >> s & 1), self._state_list[s]
+
+    def simulate_verbose(self, cadeia):
         """
         Simula a execução do AFD para uma cadeia de entrada,
-        verificando se ela é ACEITA ou REJEITADA.
+        verificando se ela é ACEITA ou REJEITADA e mostrando cada passo.
+        O passo a passo é acumulado em uma lista e impresso de uma só vez no final.
         """
         estado_atual = self.estado_inicial
-        
-        print(f"--- Simulando cadeia: '{cadeia}' ---")
-        print(f"Estado inicial: {estado_atual}")
+        trace = [f"--- Simulando cadeia: '{cadeia}' ---",
+                 f"Estado inicial: {estado_atual}"]
+        aceita = None
 
         for simbolo in cadeia:
             # Verifica se o símbolo lido pertence ao alfabeto
             if simbolo not in self.alfabeto:
-                print(f"Símbolo '{simbolo}' não pertence ao alfabeto. REJEITA.")
-                return False
+                trace.append(f"Símbolo '{simbolo}' não pertence ao alfabeto. REJEITA.")
+                aceita = False
+                break
 
             # Busca o próximo estado na função de transição
             estado_atual = self.transicoes.get((estado_atual, simbolo))
 
             # Se a transição não existe (estado de erro implícito)
             if estado_atual is None:
-                print(f"Transição inválida a partir do estado anterior com o símbolo '{simbolo}'. REJEITA.")
-                return False
-            
-            print(f"Leu '{simbolo}' -> foi para o estado: {estado_atual}")
+                trace.append(f"Transição inválida a partir do estado anterior com o símbolo '{simbolo}'. REJEITA.")
+                aceita = False
+                break
+
+            trace.append(f"Leu '{simbolo}' -> foi para o estado: {estado_atual}")
 
         # Ao final da cadeia, verifica se o estado atual é final
-        if estado_atual in self.estados_finais:
-            print(f"Fim da cadeia. Estado final '{estado_atual}'. ACEITA.")
-            return True
-        else:
-            print(f"Fim da cadeia. Estado '{estado_atual}' não é final. REJEITA.")
-            return False
+        if aceita is None:
+            aceita = estado_atual in self.estados_finais
+            if aceita:
+                trace.append(f"Fim da cadeia. Estado final '{estado_atual}'. ACEITA.")
+            else:
+                trace.append(f"Fim da cadeia. Estado '{estado_atual}' não é final. REJEITA.")
+
+        print("\n".join(trace))
+        return aceita
+
+    # Nome original do método, mantido por compatibilidade.
+    simular = simulate_verbose
 
 # --- Ponto de Execução Principal ---
 if __name__ == "__main__":
@@ -78,5 +234,5 @@ if __name__ == "__main__":
             break
         
         # 1.b. Simula o AFD com a cadeia fornecida 
-        meu_afd.simular(cadeia_usuario)
+        meu_afd.simulate_verbose(cadeia_usuario)
         print("-" * 28) # Adiciona um separador
\ No newline at end of file
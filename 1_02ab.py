@@ -5,6 +5,74 @@ Implementação de um Autômato Finito Não-determinístico (AFN ou NFA)
 com suporte a transições vazias (lambda/epsilon).
 """
 
+from array import array
+from collections import deque
+
+# NumPy e Numba são OPCIONAIS e só são importados na primeira vez que
+# são necessários (veja '_numpy' e '_jitted_run_dfa'): importá-los logo
+# no início deixaria a partida do programa décimos de segundo mais lenta,
+# mesmo quando só 'process_string' é usado.
+# False = ainda não tentamos importar; None = não está instalado.
+_np = False
+_run_dfa_jit = False
+
+
+def _numpy():
+    """
+    Retorna o módulo NumPy (importado na primeira chamada), ou None se
+    ele não estiver instalado. Sem ele, usamos versões em Python puro.
+    """
+    global _np
+    if _np is False:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _np = numpy
+    return _np
+
+
+def _jitted_run_dfa():
+    """
+    Retorna '_run_dfa' compilada para código de máquina pelo Numba
+    (importado na primeira chamada), ou None se ele não estiver instalado.
+    """
+    global _run_dfa_jit
+    if _run_dfa_jit is False:
+        try:
+            from numba import njit
+        except ImportError:
+            _run_dfa_jit = None
+        else:
+            # 'cache=True' guarda o código compilado em disco entre execuções.
+            _run_dfa_jit = njit(cache=True)(_run_dfa)
+    return _run_dfa_jit
+
+
+def _run_dfa(trans, accept, buf, start):
+    """
+    Laço "apertado" de simulação de um AFD sobre tabelas NumPy.
+
+    'trans' é a tabela (n_estados, 256) de '_dfa_tables', 'accept' o vetor
+    de aceitação e 'buf' a cadeia como array de bytes (uint8).
+    Um estado negativo (DEAD) significa que não há transição: REJEITA.
+    """
+    state = start
+    for i in range(buf.size):
+        state = trans[state, buf[i]]
+        if state < 0:
+            return False
+    return accept[state]
+
+
+# Extensão em C OPCIONAL com o mesmo laço (veja '_dfa_step.pyx').
+# Só existe se tiver sido compilada com 'cythonize -i _dfa_step.pyx'.
+try:
+    from _dfa_step import run_dfa as _run_dfa_c
+    from _dfa_step import run_dfa_batch as _run_dfa_batch_c
+except ImportError:
+    _run_dfa_c = _run_dfa_batch_c = None
+
 class NFA:
     """
     Esta classe representa a estrutura e o funcionamento de um AFN.
@@ -12,6 +80,22 @@ class NFA:
     um método para processar e validar cadeias de entrada.
     """
 
+    # Número máximo de transições guardadas no cache do AFD "preguiçoso"
+    # (veja 'process_string'). Ao estourar, o cache é esvaziado e volta a
+    # ser preenchido sob demanda, limitando o uso de memória.
+    CACHE_LIMIT = 4096
+
+    # Até quantos estados 'compile()' gera o casamento como uma cadeia de
+    # 'if/elif'. Acima disso, gera uma consulta a uma tupla constante.
+    COMPILE_CHAIN_LIMIT = 16
+
+    # Número máximo de resultados guardados por 'process_string'.
+    RESULT_CACHE_LIMIT = 1024
+
+    # Valor usado nas tabelas numéricas do AFD (veja '_dfa_tables') para
+    # indicar "sem transição" (estado morto).
+    DEAD = -1
+
     def __init__(self):
         """
         O construtor (inicializador) da classe.
@@ -40,15 +124,86 @@ class NFA:
         # um deles, a cadeia é considerada "ACEITA".
         self.accept_states = set()
 
+        # AFD equivalente, obtido pela Construção de Subconjuntos em 'to_dfa()'.
+        # Cada estado do AFD é um 'frozenset' de estados do AFN.
+        # - '_dfa_start': estado inicial do AFD (None = ainda não construído)
+        # - '_dfa_trans': dicionário (subconjunto, simbolo) -> subconjunto
+        # - '_dfa_accept': subconjuntos que contêm algum estado de aceitação
+        self._dfa_start = None
+        self._dfa_trans = {}
+        self._dfa_accept = set()
+
+        # O AFD renumerado e minimizado, (n_estados, arestas, aceitacao).
+        # None = ainda não construído. Veja '_numbered_dfa()'.
+        self._numbered = None
+
+        # O mesmo AFD, mas com os estados numerados (0 = inicial) e as
+        # transições em uma tabela de 256 colunas (uma por byte).
+        # None = ainda não construída. Veja '_dfa_tables()'.
+        self._tables = None
+
+        # Função de casamento gerada por 'compile()' (None = não compilado).
+        # Se existir, 'process_string' a usa diretamente.
+        self._compiled = None
+
+        # Representação dos conjuntos de estados como BITS de um inteiro
+        # (bitmask): o estado de índice i corresponde ao bit (1 << i).
+        # União vira '|', interseção vira '&', e o inteiro serve direto
+        # como chave de dicionário. Tudo é preenchido por '_finalize()':
+        # - '_state_idx': estado -> índice do bit
+        # - '_symbols': lista dos símbolos do alfabeto (índice -> simbolo)
+        # - '_sym_id': simbolo -> índice do símbolo no alfabeto
+        # - '_sym_to_id': lista de 256 posições, byte -> índice do símbolo
+        #                 (-1 se não for do alfabeto); None se algum símbolo
+        #                 não couber em 1 byte
+        # - '_sym_bits': bits necessários para guardar um índice de símbolo
+        # - '_delta': lista indexada pelo índice do símbolo; '_delta[j][i]' =
+        #             estados alcançáveis a partir do estado i lendo o símbolo j,
+        #             JÁ com os lambdas aplicados antes e depois (AFN "sem lambdas")
+        # - '_accept_mask': bitmask dos estados de aceitação
+        self._state_idx = {}
+        self._symbols = []
+        self._sym_id = {}
+        self._sym_to_id = None
+        self._sym_bits = 0
+        self._delta = []
+        self._accept_mask = 0
+
+        # Fecho-lambda do estado inicial (bitmask), também pré-calculado em
+        # '_finalize()'. Evita recalculá-lo a cada chamada.
+        self._initial_mask = 0
+
+        # Alfabeto "congelado" (frozenset) e, se todos os símbolos couberem
+        # em 1 byte, também como 'bytes' (senão None). Usados para rejeitar
+        # logo de cara cadeias com símbolos fora do alfabeto.
+        self._alphabet_frozen = frozenset()
+        self._alphabet_bytes = None
+
+        # Cache do AFD "preguiçoso" (lazy DFA), preenchido durante a simulação:
+        # (bitmask_atual, índice_do_simbolo) -> próximo bitmask. Os dois números
+        # são juntados em um único inteiro, (bitmask << _sym_bits) | índice,
+        # para não criar uma tupla a cada símbolo.
+        # Ao contrário de 'to_dfa()', só calcula as transições realmente usadas.
+        self._cache = {}
+
+        # Cache de resultados de 'process_string': cadeia -> True/False.
+        self._result_cache = {}
+
+        # "Sujo" (dirty) = o autômato mudou desde o último '_finalize()'
+        # e as estruturas pré-calculadas precisam ser refeitas.
+        self._dirty = True
+
     def set_start_state(self, state):
         """Define qual estado é o inicial."""
         self.start_state = state
         self.states.add(state) # Garante que o estado inicial exista no conjunto de estados
+        self._dirty = True
 
     def add_accept_state(self, state):
         """Adiciona um estado ao conjunto de estados de aceitação."""
         self.accept_states.add(state)
         self.states.add(state) # Garante que o estado de aceitação exista no conjunto de estados
+        self._dirty = True
 
     def add_transition(self, from_state, input_symbol, to_state):
         """
@@ -69,116 +224,724 @@ class NFA:
         # Cria a chave da transição
         key = (from_state, input_symbol)
         
-        # Se esta é a primeira vez que vemos uma transição saindo de (from_state, input_symbol),
-        # precisamos criar um conjunto vazio para armazenar seus destinos.
-        if key not in self.transitions:
-            self.transitions[key] = set()
-            
         # Adiciona o estado 'to_state' ao CONJUNTO de destinos possíveis.
-        self.transitions[key].add(to_state)
+        # 'setdefault' cria o conjunto vazio se esta for a primeira transição
+        # saindo de (from_state, input_symbol), com uma única consulta ao dicionário.
+        self.transitions.setdefault(key, set()).add(to_state)
 
-    def _get_lambda_closure(self, states):
+        # O grafo mudou: os fechos pré-calculados não valem mais.
+        self._dirty = True
+
+    def _finalize(self):
         """
-        Calcula o "Fecho-Lambda" (ou Fecho-Epsilon) para um conjunto de estados.
+        Pré-calcula o Fecho-Lambda de TODOS os estados de uma só vez.
 
-        Responde à pergunta: "A partir deste(s) estado(s), para quais outros
-        estados eu posso 'pular' DE GRAÇA (usando apenas transições lambda '')?"
-        
-        Este é um método auxiliar interno (indicado pelo _ no início).
+        As transições lambda só mudam durante a construção do autômato,
+        então não faz sentido refazer a busca a cada símbolo lido.
+        Usamos o algoritmo de Tarjan para achar as Componentes Fortemente
+        Conexas (SCCs) do grafo de lambdas: todos os estados de uma mesma
+        SCC alcançam uns aos outros e, portanto, têm o MESMO fecho.
+        O fecho de uma SCC é ela mesma unida aos fechos das SCCs sucessoras.
         """
-        
-        # O fecho (closure) inicial já contém os próprios estados de entrada.
-        # (Você sempre pode "alcançar" o estado onde você já está).
-        closure = set(states)
-        
-        # Usamos uma 'pilha' (stack) para gerenciar os estados que ainda
-        # precisamos verificar se têm saídas lambda.
-        # Começamos com os estados que recebemos.
-        stack = list(states)
-
-        # Enquanto houver estados na pilha para verificar...
-        while stack:
-            # Pega o último estado da pilha
-            current_state = stack.pop()
-            
-            # Verifica se existe alguma transição lambda (chave com '')
-            # saindo deste estado.
-            key = (current_state, '')
-            if key in self.transitions:
-                # Se sim, olhe todos os destinos possíveis dessa transição lambda
-                for next_state in self.transitions[key]:
-                    # Se este 'next_state' (alcançado por lambda)
-                    # ainda não está no nosso conjunto 'closure'...
-                    if next_state not in closure:
-                        # ...nós o adicionamos ao 'closure'...
-                        closure.add(next_state)
-                        # ...e o colocamos na PILHA, porque ele também
-                        # pode ter suas próprias transições lambda.
-                        stack.append(next_state)
-                        
-        # Retorna o conjunto completo de todos os estados alcançáveis via lambda.
-        return closure
+        # Grafo só com as arestas lambda: estado -> destinos via ''
+        eps_edges = {}
+        for (from_state, symbol), destinations in self.transitions.items():
+            if symbol == '':
+                eps_edges[from_state] = destinations
+
+        index = {}      # ordem de descoberta de cada estado
+        lowlink = {}    # menor índice alcançável a partir do estado
+        on_stack = set()
+        scc_stack = []
+        closure = {}
+        counter = 0
+
+        # Versão iterativa de Tarjan (evita estourar o limite de recursão
+        # do Python em autômatos grandes). Cada item da pilha de trabalho
+        # é (estado, iterador dos seus sucessores lambda).
+        for root in self.states:
+            if root in index:
+                continue
+            work = [(root, iter(eps_edges.get(root, ())))]
+            index[root] = lowlink[root] = counter
+            counter += 1
+            scc_stack.append(root)
+            on_stack.add(root)
+
+            while work:
+                state, successors = work[-1]
+                advanced = False
+                for next_state in successors:
+                    if next_state not in index:
+                        # Estado novo: "desce" nele antes de continuar.
+                        index[next_state] = lowlink[next_state] = counter
+                        counter += 1
+                        scc_stack.append(next_state)
+                        on_stack.add(next_state)
+                        work.append((next_state, iter(eps_edges.get(next_state, ()))))
+                        advanced = True
+                        break
+                    if next_state in on_stack:
+                        lowlink[state] = min(lowlink[state], index[next_state])
+                if advanced:
+                    continue
+
+                # Todos os sucessores de 'state' foram visitados.
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[state])
+
+                if lowlink[state] == index[state]:
+                    # 'state' é a raiz de uma SCC: desempilha seus membros.
+                    # Tarjan emite as SCCs em ordem topológica reversa, logo
+                    # os fechos das SCCs sucessoras já estão prontos.
+                    members = set()
+                    while True:
+                        member = scc_stack.pop()
+                        on_stack.discard(member)
+                        members.add(member)
+                        if member == state:
+                            break
+                    scc_closure = set(members)
+                    for member in members:
+                        for next_state in eps_edges.get(member, ()):
+                            if next_state not in members:
+                                scc_closure |= closure[next_state]
+                    scc_closure = frozenset(scc_closure)
+                    for member in members:
+                        closure[member] = scc_closure
+
+        # --- Tabelas em bitmask ---
+        state_idx = {state: i for i, state in enumerate(self.states)}
+        self._state_idx = state_idx
+
+        # Fecho-lambda de cada estado como bitmask. Só é usado aqui, para
+        # montar '_delta' e o conjunto inicial.
+        eps_mask = [0] * len(state_idx)
+        for state, i in state_idx.items():
+            for reached in closure[state]:
+                eps_mask[i] |= 1 << state_idx[reached]
+
+        # Primeiro, o "move" puro: destinos de cada estado lendo cada símbolo.
+        move_mask = {symbol: [0] * len(state_idx) for symbol in self.alphabet}
+        for (from_state, symbol), destinations in self.transitions.items():
+            if symbol == '':
+                continue
+            row = move_mask[symbol]
+            for to_state in destinations:
+                row[state_idx[from_state]] |= 1 << state_idx[to_state]
+
+        # Numera os símbolos do alfabeto (em ordem, para ser reprodutível).
+        symbols = sorted(self.alphabet)
+        self._symbols = symbols
+        self._sym_id = {symbol: j for j, symbol in enumerate(symbols)}
+        self._sym_bits = len(symbols).bit_length()
+        self._sym_to_id = None
+        if self._byte_alphabet():
+            self._sym_to_id = [-1] * 256
+            for symbol, j in self._sym_id.items():
+                self._sym_to_id[ord(symbol)] = j
+
+        # Depois, "embutimos" os lambdas na tabela:
+        #   delta[j][i] = fecho( move( fecho({i}), simbolo_j ) )
+        # Assim a simulação faz UMA passada por símbolo, em vez de duas.
+        delta = []
+        for symbol in symbols:
+            closed_row = [self._union_rows(eps_mask, moved) for moved in move_mask[symbol]]
+            delta.append([self._union_rows(closed_row, eps) for eps in eps_mask])
+        self._delta = delta
+
+        self._accept_mask = 0
+        for state in self.accept_states:
+            self._accept_mask |= 1 << state_idx[state]
+
+        self._alphabet_frozen = frozenset(self.alphabet)
+        self._alphabet_bytes = None
+        if self._sym_to_id is not None:
+            self._alphabet_bytes = ''.join(symbols).encode('latin-1')
+
+        if self.start_state is not None:
+            self._initial_mask = eps_mask[state_idx[self.start_state]]
+
+        self._dirty = False
+
+        # O AFD, as tabelas e o cache antigos foram construídos com os
+        # fechos antigos: descarta.
+        self._dfa_start = None
+        self._numbered = None
+        self._tables = None
+        self._compiled = None
+        self._cache = {}
+        self._result_cache = {}
+
+    @staticmethod
+    def _union_rows(rows, mask):
+        """
+        Une (com '|') as linhas 'rows[i]' de todos os bits i ligados em 'mask'.
+
+        'mask & -mask' isola o bit ligado mais baixo; 'bit_length() - 1'
+        dá o seu índice. Assim visitamos só os bits ligados.
+        """
+        result = 0
+        while mask:
+            low_bit = mask & -mask
+            result |= rows[low_bit.bit_length() - 1]
+            mask ^= low_bit
+        return result
+
+    @staticmethod
+    def _mask_to_set(mask, states):
+        """
+        Converte um bitmask de volta para um 'frozenset' de estados.
+        'states' é a lista dos estados na ordem dos seus índices de bit.
+        """
+        subset = []
+        while mask:
+            low_bit = mask & -mask
+            subset.append(states[low_bit.bit_length() - 1])
+            mask ^= low_bit
+        return frozenset(subset)
+
+    def _step_mask(self, mask, sym_id):
+        """
+        Calcula um passo do AFN a partir de um conjunto de estados (bitmask),
+        com o símbolo dado pelo seu índice no alfabeto: move com o símbolo
+        e aplica o Fecho-Lambda nos destinos. Como a tabela '_delta' já tem
+        os lambdas embutidos, basta unir as linhas dos estados ativos.
+        Retorna 0 se o autômato "morreu".
+        """
+        return self._union_rows(self._delta[sym_id], mask)
+
+    def to_dfa(self):
+        """
+        Converte o AFN em um AFD equivalente (Construção de Subconjuntos).
+
+        Cada estado do AFD é o CONJUNTO de estados em que o AFN poderia
+        estar "ao mesmo tempo". Em vez de enumerar todos os 2^n subconjuntos
+        possíveis, fazemos uma busca em largura (BFS) a partir do fecho
+        do estado inicial: só construímos os subconjuntos ALCANÇÁVEIS.
+
+        O AFD fica guardado no objeto e só é refeito se o AFN mudar.
+        Retorna a tupla (estado_inicial, transicoes, estados_de_aceitacao).
+        """
+        if self._dirty:
+            self._finalize()
+
+        if self._dfa_start is None:
+            # A busca é feita com os conjuntos como bitmasks (int): 'seen'
+            # é um conjunto de inteiros, rápidos de comparar e de "hashear".
+            start = self._initial_mask
+            mask_trans = {}
+
+            # 'seen' guarda os subconjuntos já descobertos;
+            # 'queue' (fila) os que ainda precisam ter suas saídas calculadas.
+            seen = {start}
+            queue = deque([start])
+
+            while queue:
+                mask = queue.popleft()
+
+                for j in range(len(self._symbols)):
+                    target = self._step_mask(mask, j)
+
+                    # Sem destinos = estado "morto". Não guardamos a transição:
+                    # quem usa o AFD trata a ausência da chave como REJEIÇÃO.
+                    if not target:
+                        continue
+
+                    mask_trans[(mask, j)] = target
+                    if target not in seen:
+                        seen.add(target)
+                        queue.append(target)
+
+            # Só no final convertemos cada subconjunto alcançado (uma vez só)
+            # para 'frozenset', a forma pública do AFD. O dicionário 'subsets'
+            # funciona como uma tabela de "hash-consing": o mesmo subconjunto,
+            # alcançado por caminhos diferentes, vira SEMPRE o mesmo objeto.
+            # Assim, nas consultas a 'dfa_trans' e a 'dfa_accept', o Python
+            # acha a chave pela comparação de identidade ('is'), sem comparar
+            # os conjuntos elemento a elemento.
+            states = list(self._state_idx)  # a ordem do dicionário é a ordem dos índices
+            subsets = {mask: self._mask_to_set(mask, states) for mask in seen}
+            symbols = self._symbols
+
+            self._dfa_start = subsets[start]
+            self._dfa_trans = {(subsets[mask], symbols[j]): subsets[target]
+                               for (mask, j), target in mask_trans.items()}
+            # O subconjunto é de aceitação se contém ALGUM estado final.
+            self._dfa_accept = {subsets[mask] for mask in seen
+                                if mask & self._accept_mask}
+
+        return self._dfa_start, self._dfa_trans, self._dfa_accept
+
+    def _numbered_dfa(self):
+        """
+        Renumera os estados do AFD de 'to_dfa()' com inteiros (0 = inicial)
+        e o MINIMIZA (veja '_minimize').
+
+        Retorna (n_estados, arestas, aceitacao), onde 'arestas' é um
+        dicionário (estado, simbolo) -> estado e 'aceitacao' uma lista com
+        True/False para cada estado. É a forma usada pelas tabelas
+        numéricas e pelo gerador de código. O resultado fica guardado até
+        o AFN ser alterado.
+        """
+        if self._dirty:
+            self._finalize()
+        if self._numbered is not None:
+            return self._numbered
+
+        start, dfa_trans, dfa_accept = self.to_dfa()
+
+        ids = {start: 0}
+        for (subset, symbol), target in dfa_trans.items():
+            ids.setdefault(subset, len(ids))
+            ids.setdefault(target, len(ids))
+
+        edges = {(ids[subset], symbol): ids[target]
+                 for (subset, symbol), target in dfa_trans.items()}
+
+        # 'ids' preserva a ordem de inserção, que é a ordem dos números.
+        accepting = [subset in dfa_accept for subset in ids]
+        self._numbered = self._minimize(len(ids), edges, accepting, sorted(self.alphabet))
+        return self._numbered
+
+    @staticmethod
+    def _minimize(n_states, edges, accepting, symbols):
+        """
+        Minimiza um AFD numerado com o algoritmo de Hopcroft: junta os
+        estados EQUIVALENTES (que aceitam exatamente as mesmas cadeias).
+        Menos estados = tabelas menores nos laços de simulação.
+
+        Começamos com duas "classes" (aceitação / não aceitação) e vamos
+        quebrando as classes cujos estados vão, com algum símbolo, para
+        classes diferentes, até nada mais mudar.
+        Recebe e retorna o AFD no formato de '_numbered_dfa'.
+        """
+        # Completa o AFD com um estado "morto" explícito ('sink'): as
+        # transições ausentes vão para ele, e ele só volta para si mesmo.
+        sink = n_states
+        inverse = {symbol: [[] for _ in range(n_states + 1)] for symbol in symbols}
+        for state in range(n_states + 1):
+            for symbol in symbols:
+                target = edges.get((state, symbol), sink)
+                inverse[symbol][target].append(state)
+
+        # Partição inicial: estados de aceitação e os demais.
+        final = {state for state in range(n_states) if accepting[state]}
+        others = set(range(n_states + 1)) - final
+        blocks = [block for block in (final, others) if block]
+        block_of = [0] * (n_states + 1)
+        for b, block in enumerate(blocks):
+            for state in block:
+                block_of[state] = b
+
+        # Classes que ainda precisam ser usadas para quebrar as outras.
+        # Basta começar pela menor das duas.
+        waiting = {min(range(len(blocks)), key=lambda b: len(blocks[b]))}
+
+        while waiting:
+            splitter = set(blocks[waiting.pop()])
+            for symbol in symbols:
+                # Estados que, lendo 'symbol', caem dentro do 'splitter'.
+                preimage = {}
+                for target in splitter:
+                    for state in inverse[symbol][target]:
+                        preimage.setdefault(block_of[state], set()).add(state)
+
+                for b, inside in preimage.items():
+                    block = blocks[b]
+                    if len(inside) == len(block):
+                        continue  # a classe inteira cai no splitter: não quebra
+                    outside = block - inside
+                    blocks[b] = inside
+                    blocks.append(outside)
+                    new_b = len(blocks) - 1
+                    for state in outside:
+                        block_of[state] = new_b
+                    if b in waiting:
+                        waiting.add(new_b)
+                    else:
+                        waiting.add(b if len(inside) <= len(outside) else new_b)
+
+        # Renumera as classes (a do estado inicial vira 0) e descarta a
+        # classe do 'sink': seus estados nunca aceitam, então transições
+        # para ela voltam a ser "ausentes".
+        dead = block_of[sink]
+        new_id = {block_of[0]: 0}
+        for state in range(n_states):
+            if block_of[state] != dead:
+                new_id.setdefault(block_of[state], len(new_id))
+
+        min_edges = {}
+        for (state, symbol), target in edges.items():
+            if block_of[state] in new_id and block_of[target] != dead:
+                min_edges[(new_id[block_of[state]], symbol)] = new_id[block_of[target]]
+
+        min_accepting = [False] * len(new_id)
+        for state in final:
+            min_accepting[new_id[block_of[state]]] = True
+
+        return len(new_id), min_edges, min_accepting
+
+    def _byte_alphabet(self):
+        """Verifica se todos os símbolos do alfabeto são caracteres de 1 byte (latin-1)."""
+        return all(len(symbol) == 1 and ord(symbol) <= 255 for symbol in self.alphabet)
+
+    def _dfa_tables(self):
+        """
+        Converte o AFD de 'to_dfa()' em tabelas numéricas, prontas para
+        laços "apertados" (sem dicionários nem tuplas):
+
+        - 'trans': array de inteiros com n_estados * 256 posições;
+                   trans[estado * 256 + byte] = próximo estado (ou DEAD)
+        - 'accept': bytes; accept[estado] = 1 se o estado é de aceitação
+        - 'np_trans' / 'np_accept': as mesmas tabelas como arrays NumPy
+                   de forma (n_estados, 256) e (n_estados,), ou None sem NumPy
+
+        Só funciona se todos os símbolos do alfabeto forem caracteres de
+        1 byte (latin-1). Caso contrário, retorna None.
+        """
+        if self._dirty:
+            self._finalize()
+
+        if self._tables is None:
+            if not self._byte_alphabet():
+                return None
+
+            n_states, edges, accepting = self._numbered_dfa()
+
+            trans = array('i', [self.DEAD]) * (n_states * 256)
+            for (state, symbol), target in edges.items():
+                trans[state * 256 + ord(symbol)] = target
+
+            accept = bytes(accepting)
+
+            np_trans = np_accept = None
+            np = _numpy()
+            if np is not None:
+                np_trans = np.array(trans, dtype=np.int32).reshape(n_states, 256)
+                np_accept = np.array(accepting, dtype=np.bool_)
+
+            self._tables = (trans, accept, np_trans, np_accept)
+
+        return self._tables
+
+    @staticmethod
+    def _to_bytes(input_string):
+        """
+        Converte a cadeia para 'bytes' (1 byte por caractere).
+        Retorna None se algum caractere não couber em 1 byte: nesse caso
+        ele não pode estar no alfabeto e a cadeia já é REJEITADA.
+        """
+        if isinstance(input_string, (bytes, bytearray)):
+            return bytes(input_string)
+        try:
+            return input_string.encode('latin-1')
+        except UnicodeEncodeError:
+            return None
+
+    @staticmethod
+    def _as_matrix(trans, accept):
+        """
+        Enxerga a tabela plana 'trans' como matriz (n_estados, 256), sem
+        cópia, através de um 'memoryview' (formato aceito pela extensão em C).
+        """
+        return memoryview(trans).cast('B').cast('i', (len(accept), 256))
+
+    @classmethod
+    def _run_table(cls, trans, accept, buf):
+        """
+        Versão em Python puro de '_run_dfa', sobre a tabela plana
+        'trans' (n_estados * 256) de '_dfa_tables'.
+        """
+        dead = cls.DEAD
+        state = 0
+        for byte in buf:
+            state = trans[state * 256 + byte]
+            if state == dead:
+                return False
+        return accept[state] == 1
+
+    def process_bytes(self, buf):
+        """
+        Processa uma cadeia em 'bytes' (ou 'str' de 1 byte por caractere)
+        e retorna True (ACEITA) ou False (REJEITADA).
+
+        Usa as tabelas numéricas do AFD. O laço roda, nesta ordem de
+        preferência: na extensão em C ('_dfa_step'), compilado pelo Numba
+        ('_run_dfa') ou em Python puro ('_run_table').
+        """
+        if self.start_state is None:
+            print("Erro: Estado inicial não definido.")
+            return False
+
+        tables = self._dfa_tables()
+        if tables is None:
+            # Alfabeto fora de 1 byte: usa a simulação comum.
+            if isinstance(buf, (bytes, bytearray)):
+                buf = bytes(buf).decode('latin-1')
+            return self.process_string(buf)
+
+        buf = self._to_bytes(buf)
+        if buf is None:
+            return False
+
+        # Rejeição rápida: 'translate' APAGA os bytes do alfabeto (em C).
+        # Se sobrou algum byte, ele está fora do alfabeto.
+        if buf.translate(None, self._alphabet_bytes):
+            return False
+
+        trans, accept, np_trans, np_accept = tables
+        if _run_dfa_c is not None:
+            return _run_dfa_c(self._as_matrix(trans, accept), accept, buf, 0)
+        run_dfa = _jitted_run_dfa() if np_trans is not None else None
+        if run_dfa is not None:
+            np = _numpy()
+            return bool(run_dfa(np_trans, np_accept, np.frombuffer(buf, dtype=np.uint8), 0))
+        return self._run_table(trans, accept, buf)
+
+    def process_batch(self, strings):
+        """
+        Processa VÁRIAS cadeias contra o mesmo AFN e retorna uma lista
+        de True/False (na mesma ordem).
+
+        Todas as cadeias andam "em paralelo": a cada posição, o estado de
+        todas elas avança de uma vez. Isso é feito, nesta ordem de
+        preferência: na extensão em C ('_dfa_step', com AVX2 se compilada
+        para isso), com NumPy, ou cadeia por cadeia em Python puro.
+        """
+        strings = list(strings)
+
+        if self.start_state is None:
+            print("Erro: Estado inicial não definido.")
+            return [False] * len(strings)
+
+        tables = self._dfa_tables()
+        if tables is None:
+            # Alfabeto fora de 1 byte: usa a simulação comum.
+            return [self.process_string(s) for s in strings]
+
+        trans, accept, np_trans, np_accept = tables
+        buffers = [self._to_bytes(s) for s in strings]
+
+        if not buffers:
+            return []
+
+        if _run_dfa_batch_c is not None:
+            # Cadeias TRANSPOSTAS: o caractere t da cadeia k vai para a
+            # posição t * width + k (atribuição com passo, feita em C).
+            width = len(buffers)
+            lengths = array('i', [len(buf) if buf is not None else 0 for buf in buffers])
+            columns = bytearray(max(lengths) * width)
+            for lane, buf in enumerate(buffers):
+                if buf:
+                    columns[lane:lane + len(buf) * width:width] = buf
+            out = bytearray(width)
+            _run_dfa_batch_c(self._as_matrix(trans, accept), accept, columns, lengths, 0, out)
+            return [buf is not None and flag == 1 for buf, flag in zip(buffers, out)]
+
+        np = _numpy()
+        if np is None:
+            return [buf is not None and self._run_table(trans, accept, buf)
+                    for buf in buffers]
+
+        # Matriz (n_cadeias x maior_tamanho), completada com zeros, e o
+        # tamanho real de cada cadeia (cadeias inválidas começam mortas).
+        lengths = np.array([len(buf) if buf is not None else 0 for buf in buffers])
+        matrix = np.zeros((len(buffers), int(lengths.max())), dtype=np.uint8)
+        states = np.zeros(len(buffers), dtype=np.int32)
+        for row, buf in enumerate(buffers):
+            if buf is None:
+                states[row] = self.DEAD
+            elif buf:
+                matrix[row, :len(buf)] = np.frombuffer(buf, dtype=np.uint8)
+
+        # Um passo por COLUNA: só avançam as cadeias vivas que ainda
+        # têm caracteres nessa posição.
+        for column in range(matrix.shape[1]):
+            alive = (states != self.DEAD) & (lengths > column)
+            if not alive.any():
+                break
+            states[alive] = np_trans[states[alive], matrix[alive, column]]
+
+        accepted = np.where(states != self.DEAD, np_accept[states], False)
+        return accepted.tolist()
+
+    def compile(self):
+        """
+        Gera (e guarda) uma função Python ESPECIALIZADA para este autômato.
+
+        As transições do AFD viram código: para AFDs pequenos, uma cadeia
+        de 'if/elif' por estado e por símbolo; para AFDs maiores (e alfabeto
+        de 1 byte), uma tupla constante indexada por 'estado * 256 + byte'.
+        Não sobram dicionários nem acessos a atributos no laço.
+
+        A partir daí 'process_string' usa a função gerada. Se o AFN for
+        alterado, ela é descartada e 'compile()' precisa ser chamado de novo.
+        Retorna a função gerada (ou None se não houver estado inicial).
+        """
+        if self.start_state is None:
+            print("Erro: Estado inicial não definido.")
+            return None
+
+        if self._dirty:
+            self._finalize()
+
+        n_states, edges, accepting = self._numbered_dfa()
+        accept_ids = tuple(state for state in range(n_states) if accepting[state])
+        namespace = {}
+
+        if n_states <= self.COMPILE_CHAIN_LIMIT or not self._byte_alphabet():
+            # Agrupa as arestas por estado de origem.
+            outgoing = [[] for _ in range(n_states)]
+            for (state, symbol), target in sorted(edges.items(), key=repr):
+                outgoing[state].append((symbol, target))
+
+            lines = ["def match(s):",
+                     "    st = 0",
+                     "    for c in s:"]
+            for state in range(n_states):
+                keyword = "if" if state == 0 else "elif"
+                lines.append(f"        {keyword} st == {state}:")
+                if not outgoing[state]:
+                    lines.append("            return False")
+                    continue
+                for position, (symbol, target) in enumerate(outgoing[state]):
+                    keyword = "if" if position == 0 else "elif"
+                    lines.append(f"            {keyword} c == {symbol!r}:")
+                    lines.append(f"                st = {target}")
+                lines.append("            else:")
+                lines.append("                return False")
+            lines.append(f"    return st in {accept_ids!r}")
+        else:
+            trans, accept, _, _ = self._dfa_tables()
+            namespace["_T"] = tuple(trans)
+            namespace["_A"] = tuple(bool(flag) for flag in accept)
+            lines = ["def match(s, _T=_T, _A=_A):",
+                     "    st = 0",
+                     "    for c in s:",
+                     "        o = ord(c)",
+                     "        if o > 255:",
+                     "            return False",
+                     "        st = _T[st * 256 + o]",
+                     "        if st < 0:",
+                     "            return False",
+                     "    return _A[st]"]
+
+        exec("\n".join(lines), namespace)
+        self._compiled = namespace["match"]
+        return self._compiled
+
+    def clear_cache(self):
+        """
+        Esvazia os caches preenchidos durante as simulações: os resultados
+        de 'process_string' e as transições do AFD "preguiçoso".
+        (Eles também são esvaziados sozinhos quando o AFN muda.)
+        """
+        self._result_cache.clear()
+        self._cache.clear()
 
     def process_string(self, input_string):
         """
         Simula o AFN processando uma cadeia de entrada (input_string)
         e retorna True (ACEITA) ou False (REJEITADA).
+
+        O resultado de cada cadeia fica guardado em cache: perguntar de novo
+        pela mesma cadeia (comum no laço interativo) não refaz a simulação.
+        Só entradas do tipo 'str' vão para o cache; outras sequências de
+        símbolos (ex: uma lista, para símbolos de vários caracteres) são
+        sempre simuladas.
         """
         
         if self.start_state is None:
             print("Erro: Estado inicial não definido.")
             return False
 
+        # Refaz os fechos pré-calculados (e zera os caches) se o autômato mudou.
+        if self._dirty:
+            self._finalize()
+
+        cacheable = isinstance(input_string, str)
+        if cacheable:
+            result = self._result_cache.get(input_string)
+            if result is not None:
+                return result
+
+        # Se o autômato foi especializado com 'compile()', usa a função gerada
+        # (ela compara caracteres, então só serve para entradas 'str').
+        if self._compiled is not None and isinstance(input_string, str):
+            result = self._compiled(input_string)
+        else:
+            result = self._simulate_lazy(input_string)
+
+        if cacheable:
+            if len(self._result_cache) >= self.RESULT_CACHE_LIMIT:
+                self._result_cache.clear()
+            self._result_cache[input_string] = result
+        return result
+
+    def _simulate_lazy(self, input_string):
+        """
+        Simulação propriamente dita de 'process_string'.
+
+        Monta o AFD equivalente de forma "preguiçosa" (lazy DFA): cada
+        transição (subconjunto, simbolo) é calculada na primeira vez que
+        aparece e guardada em cache. Chamadas seguintes que passem pelos
+        mesmos subconjuntos custam só UMA consulta ao dicionário por símbolo,
+        sem o risco de construir os 2^n estados do AFD completo.
+        """
+        # Rejeição rápida: transições lambda não consomem símbolos, então
+        # uma cadeia com QUALQUER símbolo fora do alfabeto nunca é aceita.
+        if not self._alphabet_frozen.issuperset(input_string):
+            return False
+
+        # Copiamos para variáveis locais, que são mais rápidas de acessar.
+        cache = self._cache
+
         # --- PASSO 1: ESTADO INICIAL ---
-        # Em um AFN com lambdas, não começamos *apenas* no estado inicial.
         # Começamos em TODOS os estados alcançáveis a partir do estado inicial
-        # usando o Fecho-Lambda.
-        # 'current_states' é um CONJUNTO. Ele rastreia TODOS os lugares
-        # onde o autômato pode estar "ao mesmo tempo".
-        current_states = self._get_lambda_closure({self.start_state})
+        # usando o Fecho-Lambda (já pré-calculado). 'current_states' é um bitmask (int).
+        current_states = self._initial_mask
+
+        # Se o alfabeto cabe em 1 byte e a entrada é uma 'str', percorremos a
+        # cadeia como 'bytes': cada símbolo vira um inteiro e o seu índice sai
+        # de uma lista (sem criar strings de 1 caractere). Senão (ex: uma
+        # lista de símbolos), o índice sai de um dicionário.
+        # (A verificação acima garante que todo símbolo está no alfabeto.)
+        if self._sym_to_id is not None and isinstance(input_string, str):
+            symbols = input_string.encode('latin-1')
+            sym_id = self._sym_to_id
+        else:
+            symbols = input_string
+            sym_id = self._sym_id
+        sym_bits = self._sym_bits
 
         # --- PASSO 2: CONSUMIR A CADEIA ---
-        # Itera por cada símbolo (letra) da cadeia de entrada.
-        for symbol in input_string:
-            
-            # 'next_states' será o conjunto de estados onde estaremos
-            # APÓS consumir o 'symbol'.
-            next_states = set()
-            
-            # Para CADA estado em que estamos atualmente...
-            for state in current_states:
-                
-                # ...verificamos se existe uma transição definida
-                # para (estado_atual, simbolo_atual).
-                key = (state, symbol)
-                if key in self.transitions:
-                    # Se houver, pegamos TODOS os destinos dessa transição
-                    # e os adicionamos ao conjunto 'next_states'.
-                    for dest_state in self.transitions[key]:
-                        next_states.add(dest_state)
-            
-            # --- PASSO 3: APLICAR LAMBDAS NOVAMENTE ---
-            # Após nos movermos para 'next_states' consumindo o 'symbol',
-            # devemos IMEDIATAMENTE calcular o fecho-lambda desses novos estados.
-            # (Talvez possamos "pular de graça" para outros estados a partir dali).
-            current_states = self._get_lambda_closure(next_states)
-
-            # Otimização: Se em algum momento o conjunto de estados ativos
-            # ficar vazio, significa que o autômato "morreu" e não
-            # tem mais caminhos possíveis. Podemos parar cedo.
+        for symbol in symbols:
+            j = sym_id[symbol]
+            key = (current_states << sym_bits) | j
+            next_states = cache.get(key)
+
+            if next_states is None:
+                # Cache miss: calcula o passo (move + fecho-lambda) e guarda.
+                # Se o cache estiver cheio, esvaziamos antes (memória limitada).
+                if len(cache) >= self.CACHE_LIMIT:
+                    cache.clear()
+                next_states = self._step_mask(current_states, j)
+                cache[key] = next_states
+
+            current_states = next_states
+
+            # Se o conjunto de estados ativos ficar vazio (bitmask 0), o
+            # autômato "morreu" e não tem mais caminhos possíveis.
             if not current_states:
-                break
+                return False
 
-        # --- PASSO 4: VERIFICAÇÃO FINAL ---
-        # Após o loop terminar (todos os símbolos foram lidos),
-        # verificamos em quais estados 'current_states' terminamos.
-        
-        # A cadeia é ACEITA se a INTERSEÇÃO (&) entre os estados
-        # onde estamos (current_states) e os estados de aceitação
-        # (self.accept_states) NÃO for vazia.
-        # Ou seja, se PELO MENOS UM dos nossos estados atuais
-        # for um estado de aceitação.
-        return bool(current_states & self.accept_states)
+        # --- PASSO 3: VERIFICAÇÃO FINAL ---
+        # A cadeia é ACEITA se PELO MENOS UM dos estados atuais for de
+        # aceitação: basta um '&' entre os bitmasks.
+        return bool(current_states & self._accept_mask)
 
 # -----------------------------------------------------------------
 # --- PARTE 2: DEFINIÇÃO DO AFN (Ex: aceita 'aa' OU 'bb') ---
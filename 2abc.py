@@ -6,6 +6,16 @@ Autômato a Pilha Não-Determinístico (APN ou PDA)
 [Referente à Questão 2.1]
 """
 
+from collections import defaultdict
+
+
+class LimiteDePassosExcedido(RuntimeError):
+    """
+    Lançada por PDA.simulate quando a busca gera mais configurações que
+    'max_passos'. A cadeia NÃO foi rejeitada: a simulação desistiu.
+    """
+
+
 class PDA:
     """
     Implementa a representação de um Autômato a Pilha 
@@ -22,10 +32,14 @@ class PDA:
         self.stack_alphabet = set()
         
         # O cérebro do APN: a função de transição.
-        # É um dicionário onde:
-        # Chave: (estado, simbolo_entrada, simbolo_topo_pilha)
-        # Valor: um CONJUNTO de tuplas (novo_estado, simbolos_a_empilhar)
-        self.transitions = {}
+        # É um dicionário de dois níveis:
+        # Chave: (estado, simbolo_topo_pilha)
+        # Valor: outro dicionário, onde
+        #     Chave: simbolo_entrada ('' para transições lambda)
+        #     Valor: uma LISTA de tuplas (novo_estado, simbolos_a_empilhar)
+        # Assim, a partir de uma configuração (estado, topo), as transições
+        # lendo um símbolo e as transições lambda saem com uma consulta cada.
+        self.transitions = defaultdict(lambda: defaultdict(list))
         
         self.start_state = None
         self.start_symbol = None  # Símbolo inicial da pilha (ex: 'Z')
@@ -45,9 +59,10 @@ class PDA:
             stack_top (str): Símbolo que deve estar no topo da pilha para 
                              que a transição ocorra.
             to_state (str): Estado de destino
-            push_symbols (str): Símbolos para empilhar.
-                                A simulação (Parte 2.2) implementará:
-                                - Se 'push_symbols' = 'AB', 'B' vai para o topo.
+            push_symbols (str): Símbolos para empilhar no lugar de 'stack_top'.
+                                A simulação ('simulate') faz:
+                                - Se 'push_symbols' = 'AB', 'A' vai para o topo
+                                  (como em '0Z' no exemplo abaixo).
                                 - Se 'push_symbols' = '', é uma ação de POP.
         """
         # Adiciona os estados e símbolos aos registros
@@ -56,15 +71,11 @@ class PDA:
             self.input_alphabet.add(input_sym)
         self.stack_alphabet.add(stack_top)
         
-        # Cria a chave da transição
-        key = (from_state, input_sym, stack_top)
-        
-        # Cria um conjunto vazio se for a primeira transição para esta chave
-        if key not in self.transitions:
-            self.transitions[key] = set()
-            
-        # Adiciona o resultado da transição (não-determinístico)
-        self.transitions[key].add((to_state, push_symbols))
+        # Adiciona o resultado da transição (não-determinístico).
+        # Os 'defaultdict' criam as entradas vazias na primeira vez.
+        destinos = self.transitions[(from_state, stack_top)][input_sym]
+        if (to_state, push_symbols) not in destinos:  # evita duplicatas
+            destinos.append((to_state, push_symbols))
 
     def set_start(self, state, symbol):
         """Define o estado inicial e o símbolo inicial da pilha."""
@@ -78,6 +89,117 @@ class PDA:
         self.final_states.add(state)
         self.states.add(state)
 
+    def simulate(self, cadeia, limite_pilha=None, max_passos=None):
+        """
+        Simula o APN sobre a cadeia e retorna True (ACEITA) ou False (REJEITADA).
+        A aceitação é por ESTADO FINAL.
+        [Referente à Questão 2.2]
+
+        Em vez de testar cada caminho com recursão (backtracking, que pode
+        explodir exponencialmente), fazemos uma busca em LARGURA: guardamos
+        o CONJUNTO de todas as configurações (estado, pilha) possíveis e
+        avançamos todas juntas, um símbolo por vez. Configurações repetidas
+        são descartadas.
+
+        Como transições lambda podem empilhar para sempre, configurações com
+        a pilha mais alta que 'limite_pilha' são descartadas. Só isso não
+        basta: o número de pilhas distintas ainda pode crescer como
+        |Γ|^limite_pilha. Por isso também contamos as configurações geradas
+        e DESISTIMOS quando passam de 'max_passos'.
+
+        Args:
+            cadeia (str): Cadeia de entrada
+            limite_pilha (int): Altura máxima da pilha. Se None, usa
+                                (tamanho da cadeia + nº de estados) vezes o
+                                maior número de símbolos empilhados de uma vez.
+            max_passos (int): Máximo de configurações geradas. Se None, usa
+                              (tamanho da cadeia + 1) * nº de estados * limite_pilha.
+
+        Raises:
+            LimiteDePassosExcedido: se 'max_passos' for ultrapassado. Nesse
+                                    caso a resposta é desconhecida (não é
+                                    uma rejeição).
+        """
+        if self.start_state is None:
+            print("Erro: Estado inicial não definido.")
+            return False
+
+        transitions = self.transitions
+
+        if limite_pilha is None:
+            maior_push = max((len(push) for por_simbolo in transitions.values()
+                              for destinos in por_simbolo.values()
+                              for _, push in destinos), default=1)
+            limite_pilha = (len(cadeia) + len(self.states)) * max(maior_push, 1) + 1
+        if max_passos is None:
+            max_passos = (len(cadeia) + 1) * max(len(self.states), 1) * limite_pilha
+        passos = 0
+
+        # A pilha é uma lista encadeada de "células" (topo, resto), e cada
+        # célula distinta recebe um número (id). Assim:
+        # - empilhar/desempilhar não copia a pilha (o 'resto' é compartilhado);
+        # - uma configuração é só (estado, id_da_pilha), rápida de comparar.
+        # A célula 0 é a pilha vazia.
+        celulas = {}       # (topo, id_resto) -> id
+        topos = [None]     # id -> símbolo do topo
+        restos = [0]       # id -> id da pilha sem o topo
+        alturas = [0]      # id -> altura da pilha
+
+        def empilha(pilha, simbolos):
+            # O primeiro símbolo de 'simbolos' fica no topo: empilhamos de trás para frente.
+            for simbolo in reversed(simbolos):
+                chave = (simbolo, pilha)
+                nova = celulas.get(chave)
+                if nova is None:
+                    nova = celulas[chave] = len(topos)
+                    topos.append(simbolo)
+                    restos.append(pilha)
+                    alturas.append(alturas[pilha] + 1)
+                pilha = nova
+            return pilha
+
+        def avanca(configs, simbolo):
+            # Configurações alcançadas aplicando UMA transição lendo 'simbolo'
+            # ('' = lambda): desempilha o topo e empilha 'push'.
+            for estado, pilha in configs:
+                if pilha == 0:
+                    continue  # pilha vazia: nenhuma transição possível
+                por_simbolo = transitions.get((estado, topos[pilha]))
+                if por_simbolo is None:
+                    continue
+                for novo_estado, push in por_simbolo.get(simbolo, ()):
+                    nova_pilha = empilha(restos[pilha], push)
+                    if alturas[nova_pilha] <= limite_pilha:
+                        yield (novo_estado, nova_pilha)
+
+        def fecho_lambda(configs):
+            # Ponto fixo: aplica transições lambda até não surgir nada novo.
+            nonlocal passos
+            fecho = set(configs)
+            pendentes = list(fecho)
+            passos += len(fecho)
+            while True:
+                if passos > max_passos:
+                    raise LimiteDePassosExcedido(
+                        f"Simulação interrompida após {max_passos} configurações.")
+                if not pendentes:
+                    return fecho
+                for config in avanca([pendentes.pop()], ''):
+                    if config not in fecho:
+                        fecho.add(config)
+                        pendentes.append(config)
+                        passos += 1
+
+        # Configuração inicial: estado inicial com só o símbolo inicial na pilha.
+        configs = fecho_lambda({(self.start_state, empilha(0, self.start_symbol))})
+
+        for simbolo in cadeia:
+            configs = fecho_lambda(set(avanca(configs, simbolo)))
+            if not configs:
+                return False  # nenhum caminho possível: REJEITA
+
+        return any(estado in self.final_states for estado, _ in configs)
+
 # -----------------------------------------------------------------
 # --- Exemplo de Uso (Definindo o APN) ---
 # -----------------------------------------------------------------
@@ -114,7 +236,14 @@ print(f"Estado Inicial: {meu_apn.start_state}")
 print(f"Símbolo Inicial da Pilha: {meu_apn.start_symbol}")
 print(f"Estados Finais: {meu_apn.final_states}")
 print("\nTransições Definidas:")
-for chave, valor in meu_apn.transitions.items():
-    print(f"  Se {chave} -> ir para {valor}")
+for (estado, topo), por_simbolo in meu_apn.transitions.items():
+    for simbolo, destinos in por_simbolo.items():
+        print(f"  Se {(estado, simbolo, topo)} -> ir para {destinos}")
 
-print("\n(Nota: A lógica de simulação [Questão 2.2] é que irá de fato executar as operações de 'push' e 'pop'.)")
\ No newline at end of file
+# -----------------------------------------------------------------
+# --- Simulação do APN [Questão 2.2] ---
+# -----------------------------------------------------------------
+print("\n--- Simulando o APN ---")
+for cadeia in ['01', '0011', '000111', '', '0', '10', '0101', '00111']:
+    resultado = "ACEITA" if meu_apn.simulate(cadeia) else "REJEITADA"
+    print(f"  '{cadeia}': {resultado}")
\ No newline at end of file
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3, boundscheck=False, wraparound=False
+
+"""
+Laço de simulação de AFD compilado em C (extensão Cython).
+
+É a alternativa ao Numba para o 'process_bytes' do AFN (1_02ab.py):
+não depende de NumPy e não tem o atraso da compilação na primeira chamada.
+
+Para compilar (gera o módulo '_dfa_step' ao lado deste arquivo):
+    cythonize -i _dfa_step.pyx
+
+Para ativar o caminho SIMD (AVX2) de 'run_dfa_batch', compile para a CPU
+atual, por exemplo:
+    CFLAGS="-O3 -march=native" cythonize -i _dfa_step.pyx
+"""
+
+from libc.stdint cimport int32_t, uint8_t
+
+
+cdef extern from *:
+    """
+    #if defined(__AVX2__)
+    #include <immintrin.h>
+    #endif
+
+    /*
+     * Simula o AFD para 'n' cadeias ao mesmo tempo ("em lockstep").
+     * 'columns' guarda as cadeias TRANSPOSTAS: o caractere t da cadeia k
+     * fica em columns[t * n + k], então o caractere t de 8 cadeias vizinhas
+     * é contíguo na memória. Com AVX2, 8 estados ficam em um registrador
+     * e um único "gather" faz as 8 transições de uma vez.
+     */
+    static void dfa_batch(const int32_t *trans, const uint8_t *accept,
+                          const uint8_t *columns, const int32_t *lengths,
+                          Py_ssize_t n, int32_t start, uint8_t *out)
+    {
+        Py_ssize_t lane = 0;
+    #if defined(__AVX2__)
+        const __m256i dead = _mm256_set1_epi32(-1);
+        for (; lane + 8 <= n; lane += 8) {
+            __m256i state = _mm256_set1_epi32(start);
+            __m256i len = _mm256_loadu_si256((const __m256i *)(lengths + lane));
+            int32_t lanes[8];
+            for (int32_t t = 0; ; t++) {
+                /* Vivas = ainda têm caracteres E não caíram no estado morto. */
+                __m256i active = _mm256_and_si256(
+                    _mm256_cmpgt_epi32(len, _mm256_set1_epi32(t)),
+                    _mm256_cmpgt_epi32(state, dead));
+                if (_mm256_testz_si256(active, active))
+                    break;
+                __m128i raw = _mm_loadl_epi64(
+                    (const __m128i *)(columns + (Py_ssize_t)t * n + lane));
+                __m256i index = _mm256_add_epi32(
+                    _mm256_slli_epi32(state, 8), _mm256_cvtepu8_epi32(raw));
+                /* Só as pistas ativas leem a tabela; as outras mantêm o estado. */
+                state = _mm256_mask_i32gather_epi32(
+                    state, (const int *)trans, index, active, 4);
+            }
+            _mm256_storeu_si256((__m256i *)lanes, state);
+            for (int k = 0; k < 8; k++)
+                out[lane + k] = lanes[k] >= 0 && accept[lanes[k]];
+        }
+    #endif
+        /* Cadeias restantes (ou todas, sem AVX2): uma de cada vez. */
+        for (; lane < n; lane++) {
+            int32_t state = start;
+            for (int32_t t = 0; t < lengths[lane] && state >= 0; t++)
+                state = trans[(Py_ssize_t)state * 256 + columns[(Py_ssize_t)t * n + lane]];
+            out[lane] = state >= 0 && accept[state];
+        }
+    }
+    """
+    void dfa_batch(const int32_t *trans, const uint8_t *accept,
+                   const uint8_t *columns, const int32_t *lengths,
+                   Py_ssize_t n, int32_t start, uint8_t *out) nogil
+
+
+cpdef bint run_dfa(const int32_t[:, ::1] trans, const uint8_t[::1] accept,
+                   const uint8_t[::1] buf, int32_t start) noexcept nogil:
+    """
+    Simula o AFD sobre a cadeia 'buf' e retorna True (ACEITA) ou False.
+
+    'trans' é a tabela (n_estados, 256) de transições, 'accept' marca os
+    estados de aceitação e um estado negativo significa "sem transição".
+    O laço só faz acessos a inteiros e roda sem o GIL, então pode ser
+    chamado de várias threads ao mesmo tempo.
+    """
+    cdef Py_ssize_t i
+    cdef int32_t state = start
+
+    for i in range(buf.shape[0]):
+        state = trans[state, buf[i]]
+        if state < 0:
+            return False
+
+    return accept[state] != 0
+
+
+def run_dfa_batch(const int32_t[:, ::1] trans, const uint8_t[::1] accept,
+                  const uint8_t[::1] columns, const int32_t[::1] lengths,
+                  int32_t start, uint8_t[::1] out):
+    """
+    Simula o AFD para várias cadeias de uma vez e escreve o resultado
+    (1 = ACEITA, 0 = REJEITADA) de cada uma em 'out'.
+
+    'columns' são as cadeias transpostas (caractere t da cadeia k na
+    posição t * n + k, onde n = len(lengths)) e 'lengths' o tamanho real
+    de cada cadeia.
+    """
+    cdef Py_ssize_t n = lengths.shape[0]
+    cdef const uint8_t *columns_ptr = NULL
+
+    if n == 0:
+        return
+    if columns.shape[0] > 0:
+        columns_ptr = &columns[0]
+
+    with nogil:
+        dfa_batch(&trans[0, 0], &accept[0], columns_ptr, &lengths[0],
+                  n, start, &out[0])